@@ -2,10 +2,27 @@ from __future__ import annotations
 
 import dash
 import dash_bootstrap_components as dbc
+import orjson
+from flask.json.provider import DefaultJSONProvider
+from flask_compress import Compress
 
 from src.layout import build_layout
 from src.callbacks import register_callbacks
 
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson (e.g. for /api/data-version)."""
+
+    _OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_UTC_Z
+
+    def dumps(self, obj, **kwargs) -> str:
+        # Types orjson does not handle natively fall back to Flask's default
+        return orjson.dumps(obj, default=self.default, option=self._OPTIONS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = dash.Dash(
     __name__,
     external_stylesheets=[dbc.themes.BOOTSTRAP],
@@ -17,6 +34,13 @@ app.layout = build_layout(app)
 register_callbacks(app)
 
 server = app.server
+server.json = OrjsonProvider(server)
+
+# Brotli (gzip fallback) for the layout, callback responses and bundles.
+# The component suite bundles are fingerprinted, Dash already serves them
+# with a one-year Cache-Control max-age.
+server.config.update(COMPRESS_ALGORITHM=["br", "gzip"], COMPRESS_MIN_SIZE=500)
+Compress(server)
 
 if __name__ == "__main__":
     app.run(debug=False)
@@ -0,0 +1,53 @@
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    tick: {
+        // Fetch the data version tokens for store-current / store-workorders.
+        // A store is only written when its token changed, so the server
+        // callbacks that depend on it do not re-run on an idle tick.
+        // store-minute gets the current minute, for the outputs that depend
+        // on the clock (stale-only filter, "ago" columns) rather than the data.
+        refresh: async function (_n, currentVersion, workordersVersion, lastMinute) {
+            const noUpdate = window.dash_clientside.no_update;
+            const minute = Math.floor(Date.now() / 60000);
+            const minuteOut = minute === lastMinute ? noUpdate : minute;
+            if (lastMinute != null && minute !== lastMinute) {
+                refreshQueueRows();
+            }
+            try {
+                const resp = await fetch(dataVersionUrl());
+                if (!resp.ok) {
+                    throw new Error("HTTP " + resp.status);
+                }
+                const version = await resp.json();
+                return [
+                    version.current === currentVersion ? noUpdate : version.current,
+                    version.workorders === workordersVersion ? noUpdate : version.workorders,
+                    minuteOut,
+                ];
+            } catch (err) {
+                // Keep the current data and try again on the next tick
+                console.warn("data-version check failed:", err);
+                return [noUpdate, noUpdate, minuteOut];
+            }
+        },
+    },
+});
+
+// The version endpoint lives under the app's requests_pathname_prefix,
+// which Dash renders into the page config.
+function dataVersionUrl() {
+    const config = JSON.parse(document.getElementById("_dash-config").textContent);
+    return config.requests_pathname_prefix + "api/data-version";
+}
+
+// Re-request the work order grid's loaded blocks so its age column follows
+// the clock. The infinite row model keeps its page, sort and filter models.
+function refreshQueueRows() {
+    if (!window.dash_ag_grid || !document.getElementById("table-workorders")) {
+        return;
+    }
+    try {
+        window.dash_ag_grid.getApi("table-workorders").refreshInfiniteCache();
+    } catch (err) {
+        // Grid not initialized yet, it loads fresh rows anyway
+    }
+}
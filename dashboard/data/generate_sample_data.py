@@ -1,8 +1,7 @@
 from __future__ import annotations
 
-import random
 from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 from pathlib import Path
 
 import numpy as np
@@ -24,20 +23,63 @@ def utc_now() -> datetime:
     return datetime.now(timezone.utc)
 
 
-def pick_status(
-    health: float,
-    open_work_orders: int,
-    fault_code_id: int | None
-) -> str:
-    if open_work_orders > 0:
-        return "UnderMaintenance"
-    if fault_code_id is not None:
-        return "Fault"
-    if health >= 80:
-        return "Running"
-    if health >= 55:
-        return "Idle"
-    return "Idle"
+def pick_status_vec(
+    health: np.ndarray,
+    open_work_orders: np.ndarray,
+    fault_code_id: np.ndarray,
+) -> np.ndarray:
+    """
+    Resolve machine status for whole arrays at once.
+
+    Precedence: open work orders, then fault (fault_code_id >= 0, -1 means
+    no fault), then health >= 80 is Running, anything else is Idle.
+    """
+    return np.select(
+        [open_work_orders > 0, fault_code_id >= 0, health >= 80],
+        ["UnderMaintenance", "Fault", "Running"],
+        default="Idle",
+    ).astype(object)
+
+
+def finalize_state(
+    rng: np.random.Generator,
+    health: np.ndarray,
+    open_work_orders: np.ndarray,
+    fault_code_id: np.ndarray,
+    status_override: np.ndarray,
+    override_recent: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Resolve each machine's status and make the generated fields agree with it.
+
+    Works on flat per-machine arrays in a single vectorized pass and returns
+    (resolved_status, health, open_work_orders, fault_code_id).
+    """
+    n = len(health)
+
+    # Resolved status using your precedence
+    status = pick_status_vec(health, open_work_orders, fault_code_id)
+
+    # A recent override wins unless under maintenance
+    status = np.where(
+        override_recent & (status != "UnderMaintenance"), status_override, status
+    )
+
+    # Enforce consistency between resolvedStatus and the generated fields.
+    # If the final resolved status is Fault, ensure we have a fault code
+    # and ensure the health score is not perfectly healthy.
+    is_fault = status == "Fault"
+    fault_code_id = np.where(
+        is_fault & (fault_code_id < 0), rng.integers(100, 140, n), fault_code_id
+    )
+    health = np.where(is_fault, np.minimum(health, rng.uniform(10, 70, n)), health)
+
+    # If the final resolved status is UnderMaintenance, ensure the state reflects it.
+    is_maint = status == "UnderMaintenance"
+    open_work_orders = np.where(is_maint & (open_work_orders == 0), 1, open_work_orders)
+    health = np.where(is_maint, np.minimum(health, rng.uniform(30, 85, n)), health)
+
+    return status, np.clip(health, 0, 100), open_work_orders, fault_code_id
 
 
 def main(
@@ -47,7 +89,6 @@ def main(
     machines_per_line: int = 20,
 ) -> None:
     rng = np.random.default_rng(seed)
-    random.seed(seed)
 
     plants = [
         Plant(1, "Plant A"),
@@ -62,175 +103,150 @@ def main(
         "ThroughputDrop",
     ]
 
-    now = utc_now()
-
-    rows_state: list[dict] = []
-    rows_work_orders: list[dict] = []
-
-    machine_id = 1001
-    telemetry_event_id = 50001
-    operator_report_id = 90001
-    work_order_id = 70001
-
-    for p in plants:
-        for li in range(1, lines_per_plant + 1):
-            line_id = int(f"{p.plant_id}{li:02d}")
-            line_name = f"Line {li}"
-
-            for _ in range(machines_per_line):
-                machine_type = random.choice(machine_types)
-
-                # Simulate timestamps
-                last_update_at = now - timedelta(minutes=int(rng.integers(0, 180)))
-                last_telemetry_at = last_update_at - timedelta(
-                    minutes=int(rng.integers(0, 10))
-                )
-
-                # Simulate base health score
-                health_score = float(np.clip(rng.normal(78, 18), 0, 100))
-
-                # Simulate work orders (maintenance) first so health can depend on it
-                open_work_order_count = int(rng.choice([0, 0, 0, 1, 2]))
-
-                # Simulate faults
-                has_fault = rng.random() < 0.18
-                fault_code_id = int(rng.integers(100, 140)) if has_fault else None
-
-                # Make health consistent with fault/maintenance states
-                # - If a machine has an active fault, it should not look perfectly healthy.
-                # - If a machine is under maintenance (open work orders), it often has reduced health.
-                if fault_code_id is not None:
-                    # Bias downward and cap the health to avoid 100 with a fault.
-                    # Typical faulty range: 0–70
-                    health_score = float(min(health_score, rng.uniform(10, 70)))
-                elif open_work_order_count > 0:
-                    # Under maintenance, health can vary but should not be perfect.
-                    # Typical maintenance range: 30–85
-                    health_score = float(min(health_score, rng.uniform(30, 85)))
-
-                # Round after adjustments
-                health_score = float(np.clip(health_score, 0, 100))
-                last_work_order_id = None
-                last_work_order_created_by_type = None
-                last_work_order_created_by_id = None
-                last_work_order_change_at = None
-
-                if open_work_order_count > 0:
-                    # Create 1 open work order record for the queue view.
-                    created_by_type = rng.choice(["User", "RuleEngine"], p=[0.6, 0.4])
-                    created_by_id = (
-                        int(rng.integers(2000, 2050))
-                        if created_by_type == "User"
-                        else int(rng.integers(300, 330))
-                    )
-                    wo_created_at = last_update_at - timedelta(
-                        minutes=int(rng.integers(5, 90))
-                    )
-
-                    last_work_order_id = work_order_id
-                    last_work_order_created_by_type = created_by_type
-                    last_work_order_created_by_id = created_by_id
-                    last_work_order_change_at = wo_created_at
-
-                    rows_work_orders.append(
-                        {
-                            "workOrderId": work_order_id,
-                            "machineId": machine_id,
-                            "plantId": p.plant_id,
-                            "plantName": p.plant_name,
-                            "lineId": line_id,
-                            "lineName": line_name,
-                            "status": "Open",
-                            "createdAt": wo_created_at.strftime("%Y-%m-%d %H:%M"),
-                            "closedAt": None,
-                            "createdByType": created_by_type,
-                            "createdById": created_by_id,
-                            "issueType": rng.choice(issue_types),
-                        }
-                    )
-                    work_order_id += 1
-
-                # Simulate operator override occasionally
-                status_override = None
-                last_operator_report_id = None
-                last_override_at = None
-                if rng.random() < 0.22:
-                    status_override = rng.choice(["Running", "Idle", "Fault"])
-                    last_operator_report_id = operator_report_id
-                    last_override_at = last_update_at - timedelta(
-                        minutes=int(rng.integers(0, 240))
-                    )
-                    operator_report_id += 1
-
-                # Resolved status using your precedence
-                resolved_status = pick_status(
-                    health_score, open_work_order_count, fault_code_id
-                )
-                if status_override is not None and last_override_at is not None:
-                    # If override is within last 4 hours, it wins unless under maintenance
-                    if resolved_status != "UnderMaintenance" and (
-                        now - last_override_at
-                    ) <= timedelta(hours=4):
-                        resolved_status = status_override
-
-                # Enforce consistency between resolvedStatus and the generated fields.
-                # If the final resolved status is Fault, ensure we have a fault code
-                # and ensure the health score is not perfectly healthy.
-                if resolved_status == "Fault":
-                    if fault_code_id is None:
-                        fault_code_id = int(rng.integers(100, 140))
-                    # Faulty machines should not have 100 health.
-                    health_score = float(min(health_score, rng.uniform(10, 70)))
-                    health_score = float(np.clip(health_score, 0, 100))
-
-                # If the final resolved status is UnderMaintenance, ensure the state reflects it.
-                if resolved_status == "UnderMaintenance":
-                    if open_work_order_count == 0:
-                        open_work_order_count = 1
-                    # Under maintenance should not look perfectly healthy.
-                    health_score = float(min(health_score, rng.uniform(30, 85)))
-                    health_score = float(np.clip(health_score, 0, 100))
-
-                rows_state.append(
-                    {
-                        # Location and hierarchy (for filtering and grouping)
-                        "plantId": p.plant_id,
-                        "plantName": p.plant_name,
-                        "lineId": line_id,
-                        "lineName": line_name,
-                        "machineType": machine_type,
-                        # CurrentMachineState core
-                        "machineId": machine_id,
-                        "resolvedStatus": resolved_status,
-                        "healthScore": round(health_score, 2),
-                        "openWorkOrderCount": open_work_order_count,
-                        "lastUpdateAt": last_update_at.strftime("%Y-%m-%d %H:%M"),
-                        # Latest pointers and event context (from your upsert)
-                        "lastTelemetryEventId": telemetry_event_id,
-                        "lastTelemetryAt": last_telemetry_at.strftime("%Y-%m-%d %H:%M"),
-                        "statusRaw": rng.choice(statuses),
-                        "faultCodeId": fault_code_id,
-                        "lastOperatorReportId": last_operator_report_id,
-                        "lastOverrideAt": (
-                            last_override_at.strftime("%Y-%m-%d %H:%M") if last_override_at else None
-                        ),
-                        "statusOverride": status_override,
-                        "lastWorkOrderId": last_work_order_id,
-                        "lastWorkOrderCreatedByType": last_work_order_created_by_type,
-                        "lastWorkOrderCreatedById": last_work_order_created_by_id,
-                        "lastWorkOrderChangeAt": (
-                            last_work_order_change_at.strftime("%Y-%m-%d %H:%M")
-                            if last_work_order_change_at
-                            else None
-                        ),
-                    }
-                )
-
-                machine_id += 1
-                telemetry_event_id += 1
-
-    df_state = pd.DataFrame(rows_state)
-    df_wo = pd.DataFrame(rows_work_orders)
+    now = pd.Timestamp(utc_now())
+
+    # One row per machine, ordered plant -> line -> machine
+    n = n_plants * lines_per_plant * machines_per_line
+
+    plant_idx = np.repeat(np.arange(n_plants), lines_per_plant * machines_per_line)
+    line_num = np.tile(
+        np.repeat(np.arange(1, lines_per_plant + 1), machines_per_line), n_plants
+    )
+    plant_ids = np.array([p.plant_id for p in plants])[plant_idx]
+    plant_names = np.array([p.plant_name for p in plants])[plant_idx]
+    line_ids = plant_ids * 100 + line_num
+    line_names = np.char.add("Line ", line_num.astype(str))
+
+    machine_ids = 1001 + np.arange(n)
+    telemetry_event_ids = 50001 + np.arange(n)
+    machine_type = rng.choice(machine_types, n)
+
+    def minutes(values: np.ndarray) -> pd.TimedeltaIndex:
+        return pd.to_timedelta(values, unit="min")
+
+    # Simulate timestamps
+    last_update_at = now - minutes(rng.integers(0, 180, n))
+    last_telemetry_at = last_update_at - minutes(rng.integers(0, 10, n))
+
+    # Simulate base health score
+    health_score = np.clip(rng.normal(78, 18, n), 0, 100)
+
+    # Simulate work orders (maintenance) first so health can depend on it
+    open_work_order_count = rng.choice([0, 0, 0, 1, 2], n)
+
+    # Simulate faults, -1 marks "no fault code"
+    has_fault = rng.random(n) < 0.18
+    fault_code_id = np.where(has_fault, rng.integers(100, 140, n), -1)
+
+    # Make health consistent with fault/maintenance states
+    # - If a machine has an active fault, it should not look perfectly healthy.
+    #   Typical faulty range: 0–70
+    # - If a machine is under maintenance (open work orders), it often has reduced health.
+    #   Typical maintenance range: 30–85
+    health_score = np.where(
+        has_fault,
+        np.minimum(health_score, rng.uniform(10, 70, n)),
+        np.where(
+            open_work_order_count > 0,
+            np.minimum(health_score, rng.uniform(30, 85, n)),
+            health_score,
+        ),
+    )
+    health_score = np.clip(health_score, 0, 100)
+
+    # Create 1 open work order record per machine with open work orders.
+    has_wo = open_work_order_count > 0
+    n_wo = int(has_wo.sum())
+    created_by_type = rng.choice(["User", "RuleEngine"], n_wo, p=[0.6, 0.4])
+    created_by_id = np.where(
+        created_by_type == "User",
+        rng.integers(2000, 2050, n_wo),
+        rng.integers(300, 330, n_wo),
+    )
+    wo_created_at = last_update_at[has_wo] - minutes(rng.integers(5, 90, n_wo))
+    wo_ids = 70001 + np.arange(n_wo)
+
+    df_wo = pd.DataFrame(
+        {
+            "workOrderId": wo_ids,
+            "machineId": machine_ids[has_wo],
+            "plantId": plant_ids[has_wo],
+            "plantName": plant_names[has_wo],
+            "lineId": line_ids[has_wo],
+            "lineName": line_names[has_wo],
+            "status": "Open",
+            "createdAt": wo_created_at.strftime("%Y-%m-%d %H:%M"),
+            "closedAt": None,
+            "createdByType": created_by_type,
+            "createdById": created_by_id,
+            "issueType": rng.choice(issue_types, n_wo),
+        }
+    )
+
+    # Per-machine pointers to its work order (NA where there is none)
+    last_work_order_id = pd.Series(pd.NA, index=range(n), dtype="Int64")
+    last_work_order_id[has_wo] = wo_ids
+    last_work_order_created_by_type = pd.Series(None, index=range(n), dtype=object)
+    last_work_order_created_by_type[has_wo] = created_by_type
+    last_work_order_created_by_id = pd.Series(pd.NA, index=range(n), dtype="Int64")
+    last_work_order_created_by_id[has_wo] = created_by_id
+    last_work_order_change_at = pd.Series(pd.NaT, index=range(n), dtype=last_update_at.dtype)
+    last_work_order_change_at[has_wo] = wo_created_at
+
+    # Simulate operator override occasionally
+    has_override = rng.random(n) < 0.22
+    status_override = np.where(
+        has_override, rng.choice(["Running", "Idle", "Fault"], n), None
+    )
+    last_operator_report_id = pd.Series(
+        90000 + np.cumsum(has_override), dtype="Int64"
+    ).where(has_override)
+    last_override_at = pd.Series(
+        last_update_at - minutes(rng.integers(0, 240, n))
+    ).where(has_override)
+
+    # Overrides only count if they are recent (within the last 4 hours)
+    override_recent = has_override & (
+        (now - last_override_at) <= pd.Timedelta(hours=4)
+    ).to_numpy()
+
+    resolved_status, health_score, open_work_order_count, fault_code_id = finalize_state(
+        rng,
+        health_score,
+        open_work_order_count,
+        fault_code_id,
+        status_override,
+        override_recent,
+    )
+
+    df_state = pd.DataFrame(
+        {
+            # Location and hierarchy (for filtering and grouping)
+            "plantId": plant_ids,
+            "plantName": plant_names,
+            "lineId": line_ids,
+            "lineName": line_names,
+            "machineType": machine_type,
+            # CurrentMachineState core
+            "machineId": machine_ids,
+            "resolvedStatus": resolved_status,
+            "healthScore": np.round(health_score, 2),
+            "openWorkOrderCount": open_work_order_count,
+            "lastUpdateAt": last_update_at.strftime("%Y-%m-%d %H:%M"),
+            # Latest pointers and event context (from your upsert)
+            "lastTelemetryEventId": telemetry_event_ids,
+            "lastTelemetryAt": last_telemetry_at.strftime("%Y-%m-%d %H:%M"),
+            "statusRaw": rng.choice(statuses, n),
+            "faultCodeId": pd.Series(fault_code_id, dtype="Int64").where(fault_code_id >= 0),
+            "lastOperatorReportId": last_operator_report_id,
+            "lastOverrideAt": last_override_at.dt.strftime("%Y-%m-%d %H:%M"),
+            "statusOverride": status_override,
+            "lastWorkOrderId": last_work_order_id,
+            "lastWorkOrderCreatedByType": last_work_order_created_by_type,
+            "lastWorkOrderCreatedById": last_work_order_created_by_id,
+            "lastWorkOrderChangeAt": last_work_order_change_at.dt.strftime("%Y-%m-%d %H:%M"),
+        }
+    )
 
     DATA_DIR.mkdir(parents=True, exist_ok=True)
     df_state.to_csv(OUT_STATE, index=False)
@@ -1,13 +1,22 @@
 from __future__ import annotations
 
+import re
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 
+import numpy as np
 import pandas as pd
-import dash_bootstrap_components as dbc
-from dash import Input, Output, html, ctx, dcc
+from dash import ClientsideFunction, Input, Output, State, html, ctx, no_update
 
 from .charts import status_pie_chart
-from .utils import ago
+from .data_loader import (
+    CURRENT_STATE_CSV,
+    WORK_ORDERS_CSV,
+    file_version,
+    load_current_state,
+    load_work_orders,
+)
+from .utils import ago_vec
 
 
 _NUMERIC_COLS = {
@@ -25,19 +34,8 @@ _NUMERIC_COLS = {
     "createdById",
 }
 
-# Match Altair / Vega-Lite categorical defaults (Tableau 10 first 4)
-# Used for KPI card backgrounds to stay consistent with the pie chart.
-STATUS_CARD_COLORS: dict[str, str] = {
-    "Running": "#4E79A7",  # blue
-    "Idle": "#F28E2B",  # orange
-    "Fault": "#E15759",  # red
-    "UnderMaintenance": "#76B7B2",  # teal
-}
-
-OTHER_CARD_COLORS: dict[str, str] = {
-    "Machines": "#6C757D",  # bootstrap secondary-ish
-    "Average health": "#59A14F",  # green
-}
+# Machines whose last update is older than this count as stale
+_STALE_AFTER = timedelta(minutes=30)
 
 
 def _now_utc() -> datetime:
@@ -63,6 +61,30 @@ def _datatable_columns(df: pd.DataFrame) -> list[dict]:
     return cols
 
 
+def _line_num(names: pd.Series) -> pd.Series:
+    """Numeric part of "Line {n}" names, so lines sort 1, 2, ..., 10."""
+    names = names.astype(str)
+    try:
+        return names.str.slice(5).astype(int)
+    except ValueError:
+        # Unexpected naming, fall back to the first number in the name
+        return names.str.extract(r"(\d+)", expand=False).fillna("0").astype(int)
+
+
+def _split_lines(lines: list[int | str], by_id: bool) -> tuple[list[int], list[str]]:
+    """Split line selections into lineIds (ints, when by_id) and lineNames."""
+    line_ids: list[int] = []
+    line_names: list[str] = []
+    for v in lines:
+        if v is None:
+            continue
+        if isinstance(v, (int, float)) and by_id:
+            line_ids.append(int(v))
+        else:
+            line_names.append(str(v))
+    return line_ids, line_names
+
+
 def apply_filters(
     df: pd.DataFrame,
     plants: list[int] | None,
@@ -71,58 +93,66 @@ def apply_filters(
     health_rng: list[int],
     stale_only: bool,
 ) -> pd.DataFrame:
-    out = df.copy()
+    # Build one boolean mask and slice once, instead of materializing
+    # an intermediate frame per filter.
+    # plantId / lineId are already Int64 from load_current_state.
+    mask = np.ones(len(df), dtype=bool)
 
     # Plant filter (multi)
-    if plants and "plantId" in out.columns:
+    if plants and "plantId" in df.columns:
         plant_ids = [int(p) for p in plants if p is not None]
         if plant_ids:
-            out = out[out["plantId"].astype("Int64").isin(plant_ids)]
+            mask &= df["plantId"].isin(plant_ids).to_numpy()
 
     # Line filter (multi)
     # - If line values are ints, treat as lineId filtering.
     # - If line values are strings, treat as lineName filtering.
     if lines:
-        line_ids: list[int] = []
-        line_names: list[str] = []
-        for v in lines:
-            if v is None:
-                continue
-            if isinstance(v, (int, float)) and "lineId" in out.columns:
-                line_ids.append(int(v))
-            else:
-                line_names.append(str(v))
-
-        if line_ids and "lineId" in out.columns:
-            out = out[out["lineId"].astype("Int64").isin(line_ids)]
-        if line_names and "lineName" in out.columns:
-            out = out[out["lineName"].astype(str).isin(line_names)]
+        line_ids, line_names = _split_lines(lines, "lineId" in df.columns)
+        if line_ids and "lineId" in df.columns:
+            mask &= df["lineId"].isin(line_ids).to_numpy()
+        if line_names and "lineName" in df.columns:
+            mask &= df["lineName"].astype(str).isin(line_names).to_numpy()
 
     # Status filter (multi)
-    if statuses and "resolvedStatus" in out.columns:
-        out = out[out["resolvedStatus"].isin(statuses)]
+    if statuses and "resolvedStatus" in df.columns:
+        mask &= df["resolvedStatus"].isin(statuses).to_numpy()
 
     # Health range
-    if health_rng and "healthScore" in out.columns:
+    if health_rng and "healthScore" in df.columns:
         lo, hi = health_rng
-        out = out[(out["healthScore"] >= lo) & (out["healthScore"] <= hi)]
+        mask &= df["healthScore"].between(lo, hi).to_numpy()
 
     # Stale only
-    if stale_only and "lastUpdateAt" in out.columns:
-        cutoff = _now_utc() - timedelta(minutes=30)
-        ts = pd.to_datetime(out["lastUpdateAt"], utc=True, errors="coerce")
-        out = out[ts.notna() & (ts < cutoff)]
+    # lastUpdateAt is already a tz-aware UTC datetime from load_current_state,
+    # and NaT compares False so missing timestamps are excluded.
+    if stale_only and "lastUpdateAt" in df.columns:
+        cutoff = _now_utc() - _STALE_AFTER
+        mask &= (df["lastUpdateAt"] < cutoff).to_numpy()
+
+    return df[mask]
 
-    return out
 
+def status_counts(df: pd.DataFrame) -> pd.Series:
+    """Machines per resolvedStatus, shared by the KPI cards and the pie chart."""
+    if "resolvedStatus" not in df.columns:
+        return pd.Series(dtype=int)
+    return df["resolvedStatus"].value_counts()
 
-def make_kpi_cards(df: pd.DataFrame) -> html.Div:
+
+def kpi_values(df: pd.DataFrame, vc: pd.Series) -> tuple[str, str, str, str, str, str]:
+    """
+    Values for the static KPI cards built by layout.kpi_cards, in card order:
+    machines, running, idle, fault, under maintenance, average health.
+
+    vc is status_counts(df).
+    """
     total = len(df)
 
-    fault = int((df["resolvedStatus"] == "Fault").sum()) if "resolvedStatus" in df.columns else 0
-    maint = int((df["resolvedStatus"] == "UnderMaintenance").sum()) if "resolvedStatus" in df.columns else 0
-    running = int((df["resolvedStatus"] == "Running").sum()) if "resolvedStatus" in df.columns else 0
-    idle = int((df["resolvedStatus"] == "Idle").sum()) if "resolvedStatus" in df.columns else 0
+    fault = int(vc.get("Fault", 0))
+    maint = int(vc.get("UnderMaintenance", 0))
+    running = int(vc.get("Running", 0))
+    idle = int(vc.get("Idle", 0))
 
     avg_health = (
         float(df["healthScore"].mean())
@@ -130,95 +160,488 @@ def make_kpi_cards(df: pd.DataFrame) -> html.Div:
         else 0.0
     )
 
-    def _card(title: str, value: str, bg: str, fg: str = "white"):
-        card = dbc.Card(
-            dbc.CardBody(
-                [
-                    html.Div(title, style={"opacity": 0.9}),
-                    html.H3(value, style={"margin": 0}),
-                ]
-            ),
-            style={
-                "backgroundColor": bg,
-                "color": fg,
-                "border": "0",
-                "boxShadow": "0 1px 2px rgba(0,0,0,0.06)",
-            },
+    return (
+        f"{total}",
+        f"{running}",
+        f"{idle}",
+        f"{fault}",
+        f"{maint}",
+        f"{avg_health:.1f}",
+    )
+
+
+def _state_version(token) -> int:
+    """
+    The current state version carried by store-current.
+
+    Callbacks read the frame cached under this token instead of statting the
+    file again. Before the first tick fills the store, the file is statted.
+    """
+    return int(token) if token else file_version(CURRENT_STATE_CSV)
+
+
+@lru_cache(maxsize=4)
+def _distinct_values(version: int) -> tuple[pd.DataFrame, list[str]]:
+    """
+    Distinct plant/line hierarchy (a few dozen rows) and sorted statuses.
+
+    One scan of the machine table per data version, shared by the dropdown
+    options and the pie title, so neither scans the full table again.
+    """
+    # Read the frame cached under this version, so the cache key and the
+    # content always match even if the CSV is replaced meanwhile
+    df = load_current_state(version)
+    hier_cols = [c for c in ("plantId", "plantName", "lineId", "lineName") if c in df.columns]
+    hier = df[hier_cols].drop_duplicates()
+    statuses = sorted(df["resolvedStatus"].dropna().unique().tolist()) if "resolvedStatus" in df.columns else []
+    return hier, statuses
+
+
+@lru_cache(maxsize=64)
+def _filter_options(
+    version: int,
+    selected_plants: tuple[int, ...],
+) -> tuple[list[dict], list[dict], list[dict]]:
+    """
+    Plant, line and status dropdown options.
+
+    Cached per data version and plant selection: the lists only change when
+    the CSV does, or when the selection switches the line option mode.
+    """
+    hier, status_vals = _distinct_values(version)
+
+    plant_opts: list[dict] = []
+    line_opts: list[dict] = []
+    status_opts: list[dict] = []
+
+    if hier.empty and not status_vals:
+        return plant_opts, line_opts, status_opts
+
+    # Plants
+    plant_vals = (
+        hier[["plantId", "plantName"]]
+        .dropna(subset=["plantId", "plantName"])
+        .drop_duplicates(subset=["plantId"])
+        .sort_values(["plantName"])
+    )
+    plant_opts = [
+        {"label": name, "value": int(pid)}
+        for pid, name in zip(plant_vals["plantId"].to_numpy(), plant_vals["plantName"].to_numpy())
+    ]
+
+    # Decide line option mode based on plant selection
+    # - If exactly one plant is selected, show that plant's lines and filter by lineId.
+    # - If none or multiple plants are selected, show unique lineName and filter by lineName.
+    if len(selected_plants) == 1:
+        pid = selected_plants[0]
+        df_lines = hier[hier["plantId"] == pid][["lineId", "lineName"]]
+        df_lines = (
+            df_lines
+            .dropna(subset=["lineId", "lineName"])
+            .drop_duplicates(subset=["lineId"])
+            .assign(_line_num=lambda d: _line_num(d["lineName"]))
+            .sort_values(["_line_num", "lineName"])
         )
-        return dcc.Loading(children=card)
-
-    cards = dbc.Row(
-        [
-            dbc.Col(
-                _card(
-                    "Machines",
-                    f"{total}",
-                    OTHER_CARD_COLORS["Machines"],
-                )
-            ),
-            dbc.Col(
-                _card(
-                    "Running",
-                    f"{running}",
-                    STATUS_CARD_COLORS["Running"],
-                )
-            ),
-            dbc.Col(
-                _card(
-                    "Idle",
-                    f"{idle}",
-                    STATUS_CARD_COLORS["Idle"],
-                )
-            ),
-            dbc.Col(
-                _card(
-                    "Fault",
-                    f"{fault}",
-                    STATUS_CARD_COLORS["Fault"],
-                )
-            ),
-            dbc.Col(
-                _card(
-                    "Under maintenance",
-                    f"{maint}",
-                    STATUS_CARD_COLORS["UnderMaintenance"],
-                )
-            ),
-            dbc.Col(
-                _card(
-                    "Average health",
-                    f"{avg_health:.1f}",
-                    OTHER_CARD_COLORS["Average health"],
-                )
-            ),
-        ],
-        className="g-3",
-        justify="around",
-        style={"margin": "0px", "padding": "0px"},
+        line_opts = [
+            {"label": name, "value": int(lid)}
+            for lid, name in zip(df_lines["lineId"].to_numpy(), df_lines["lineName"].to_numpy())
+        ]
+    else:
+        df_lines = hier[["lineName"]]
+        df_lines = (
+            df_lines
+            .dropna(subset=["lineName"])
+            .drop_duplicates(subset=["lineName"])
+            .assign(_line_num=lambda d: _line_num(d["lineName"]))
+            .sort_values(["_line_num", "lineName"])
+        )
+        line_opts = [
+            {"label": name, "value": str(name)}
+            for name in df_lines["lineName"].to_numpy()
+        ]
+
+    # Status
+    status_opts = [{"label": s, "value": s} for s in status_vals]
+
+    return plant_opts, line_opts, status_opts
+
+
+def filter_work_orders(
+    df_wo: pd.DataFrame,
+    plants: list[int] | None,
+    lines: list[int | str] | None,
+) -> pd.DataFrame:
+    """Work orders scoped by the same plant / line selection as the machine table."""
+    if df_wo.empty:
+        return df_wo
+
+    # Combine the scope filters into one mask and slice once
+    mask = np.ones(len(df_wo), dtype=bool)
+
+    # Plant scope (multi)
+    if plants and "plantId" in df_wo.columns:
+        plant_ids = [int(p) for p in plants if p is not None]
+        if plant_ids:
+            mask &= df_wo["plantId"].isin(plant_ids).to_numpy()
+
+    # Line scope (multi)
+    # - If line selections are ints, filter by lineId.
+    # - If line selections are strings, filter by lineName.
+    if lines:
+        line_ids, line_names = _split_lines(lines, "lineId" in df_wo.columns)
+        if line_ids and "lineId" in df_wo.columns:
+            mask &= df_wo["lineId"].isin(line_ids).to_numpy()
+        if line_names and "lineName" in df_wo.columns:
+            mask &= df_wo["lineName"].astype(str).isin(line_names).to_numpy()
+
+    return df_wo[mask]
+
+
+_CURRENT_COLS = [
+    "machineId",
+    "resolvedStatus",
+    "healthScore",
+    "openWorkOrderCount",
+    "lastUpdateAt",
+    "plantName",
+    "lineName",
+    "machineType",
+    "faultCodeId",
+    "lastWorkOrderId",
+    "lastWorkOrderCreatedByType",
+    "lastWorkOrderCreatedById",
+]
+
+_QUEUE_EMPTY_COLS = ["workOrderId", "machineId", "status", "createdAt", "age", "createdByType", "createdById", "issueType"]
+
+_DATETIME_FMT = "%Y-%m-%d %H:%M"
+
+# "{col} op value" and "{col} is kind" terms of a DataTable filter_query,
+# joined by " && ". Operators may carry an i/s (case) prefix, e.g.
+# "icontains", "s>=". Anything else ("or", parentheses, "!") matches no
+# rows, see layout.table_filter_help.
+_FILTER_TERM = re.compile(
+    r"^\{(?P<col>[^}]+)\}\s+(?P<case>[is]?)"
+    r"(?P<op>contains|datestartswith|eq|ne|lt|le|gt|ge|=|!=|<=|>=|<|>)\s+(?P<value>[^{}]+)$",
+    re.IGNORECASE,
+)
+_FILTER_UNARY = re.compile(
+    r"^\{(?P<col>[^}]+)\}\s+is\s+(?P<kind>blank|nil|num|str|even|odd)$",
+    re.IGNORECASE,
+)
+_FILTER_OPS = {"eq": "=", "ne": "!=", "lt": "<", "le": "<=", "gt": ">", "ge": ">="}
+# AG Grid filterModel condition types with a direct equivalent above
+_AG_FILTER_OPS = {
+    "contains": "contains",
+    "equals": "=",
+    "notEqual": "!=",
+    "lessThan": "<",
+    "lessThanOrEqual": "<=",
+    "greaterThan": ">",
+    "greaterThanOrEqual": ">=",
+    "startsWith": "datestartswith",
+    "endsWith": "endswith",
+}
+# Filter options offered by the work order grid, all handled by _filter_model_mask
+_AG_TEXT_FILTER_OPTIONS = [
+    "contains", "notContains", "equals", "notEqual", "startsWith", "endsWith", "blank", "notBlank",
+]
+_AG_NUMBER_FILTER_OPTIONS = [
+    "equals", "notEqual", "lessThan", "lessThanOrEqual", "greaterThan", "greaterThanOrEqual",
+    "inRange", "blank", "notBlank",
+]
+_COMPARE = {
+    "=": lambda s, v: s == v,
+    "!=": lambda s, v: s != v,
+    "<": lambda s, v: s < v,
+    "<=": lambda s, v: s <= v,
+    ">": lambda s, v: s > v,
+    ">=": lambda s, v: s >= v,
+}
+
+
+def _filter_unary_mask(s: pd.Series, kind: str) -> np.ndarray:
+    numeric = pd.api.types.is_numeric_dtype(s)
+    if kind == "nil":
+        return s.isna().to_numpy(bool)
+    if kind == "blank":
+        return (s.isna() | (s.astype(str) == "")).to_numpy(bool)
+    if kind == "num":
+        return s.notna().to_numpy(bool) if numeric else np.zeros(len(s), dtype=bool)
+    if kind == "str":
+        # Timestamps are sent to the browser as formatted strings
+        return np.zeros(len(s), dtype=bool) if numeric else s.notna().to_numpy(bool)
+    # even / odd
+    if not numeric:
+        return np.zeros(len(s), dtype=bool)
+    return (s % 2 == (0 if kind == "even" else 1)).fillna(False).to_numpy(bool)
+
+
+def _filter_term_mask(s: pd.Series, case: str, op: str, value: str) -> np.ndarray:
+    op = _FILTER_OPS.get(op, op)
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'`":
+        value = value[1:-1]
+
+    if pd.api.types.is_datetime64_any_dtype(s):
+        # Match against the displayed "%Y-%m-%d %H:%M" text
+        if op == "contains":
+            return s.dt.strftime(_DATETIME_FMT).str.contains(value, regex=False).fillna(False).to_numpy(bool)
+        if op == "datestartswith":
+            return s.dt.strftime(_DATETIME_FMT).str.startswith(value).fillna(False).to_numpy(bool)
+        if op == "endswith":
+            return s.dt.strftime(_DATETIME_FMT).str.endswith(value).fillna(False).to_numpy(bool)
+        try:
+            ts = pd.Timestamp(value)
+        except ValueError:
+            return np.zeros(len(s), dtype=bool)
+        if ts.tzinfo is None:
+            ts = ts.tz_localize("UTC")
+        return _COMPARE[op](s, ts).fillna(False).to_numpy(bool)
+
+    if op in _COMPARE and pd.api.types.is_numeric_dtype(s):
+        try:
+            return _COMPARE[op](s, float(value)).fillna(False).to_numpy(bool)
+        except ValueError:
+            return np.zeros(len(s), dtype=bool)
+
+    text = s.astype(str).where(s.notna(), "")
+    if case == "i":
+        text, value = text.str.lower(), value.lower()
+    if op == "contains":
+        return text.str.contains(value, regex=False).to_numpy(bool)
+    if op == "datestartswith":
+        return text.str.startswith(value).to_numpy(bool)
+    if op == "endswith":
+        return text.str.endswith(value).to_numpy(bool)
+    return _COMPARE[op](text, value).to_numpy(bool)
+
+
+def _filter_query_mask(df: pd.DataFrame, filter_query: str | None, ages: dict[str, str]) -> np.ndarray:
+    """
+    Rows of df matching a DataTable filter_query (terms joined by " && ").
+
+    A term that cannot be parsed, or names an unknown column, matches no
+    rows, so an active filter never silently shows unfiltered data.
+    Terms on an ages column are checked against its "... ago" text.
+    """
+    mask = np.ones(len(df), dtype=bool)
+    for part in (filter_query or "").split(" && "):
+        part = part.strip()
+        if not part:
+            continue
+
+        m = _FILTER_UNARY.match(part) or _FILTER_TERM.match(part)
+        if m is None:
+            return np.zeros(len(df), dtype=bool)
+        col = m["col"]
+        if col in ages and ages[col] in df.columns:
+            s = ago_vec(df[ages[col]], _now_utc())
+        elif col in df.columns:
+            s = df[col]
+        else:
+            return np.zeros(len(df), dtype=bool)
+
+        if m.re is _FILTER_UNARY:
+            mask &= _filter_unary_mask(s, m["kind"].lower())
+        else:
+            mask &= _filter_term_mask(s, m["case"].lower(), m["op"].lower(), m["value"].strip())
+    return mask
+
+
+def _filter_model_mask(df: pd.DataFrame, filter_model: dict | None) -> np.ndarray:
+    """
+    Rows of df matching an AG Grid filterModel.
+
+    Text filters are case-insensitive, as in the grid. The grid only offers
+    the condition types in _AG_TEXT_FILTER_OPTIONS / _AG_NUMBER_FILTER_OPTIONS.
+    """
+    def condition(s: pd.Series, cond: dict) -> np.ndarray:
+        kind = cond.get("type")
+        if kind == "blank":
+            return _filter_unary_mask(s, "blank")
+        if kind == "notBlank":
+            return ~_filter_unary_mask(s, "blank")
+        if kind == "inRange":
+            return (
+                _filter_term_mask(s, "i", ">=", str(cond["filter"]))
+                & _filter_term_mask(s, "i", "<=", str(cond["filterTo"]))
+            )
+        if kind == "notContains":
+            return ~_filter_term_mask(s, "i", "contains", str(cond["filter"]))
+        if kind not in _AG_FILTER_OPS or cond.get("filter") is None:
+            return np.ones(len(s), dtype=bool)
+        return _filter_term_mask(s, "i", _AG_FILTER_OPS[kind], str(cond["filter"]))
+
+    mask = np.ones(len(df), dtype=bool)
+    for col, model in (filter_model or {}).items():
+        if col not in df.columns:
+            continue
+        s = df[col]
+        if "conditions" in model:
+            masks = [condition(s, c) for c in model["conditions"]]
+            if model.get("operator") == "OR":
+                mask &= np.logical_or.reduce(masks)
+            else:
+                mask &= np.logical_and.reduce(masks)
+        else:
+            mask &= condition(s, model)
+    return mask
+
+
+def _sort_rows(
+    df: pd.DataFrame,
+    sort_by: list[tuple[str, bool]],
+    ages: dict[str, str],
+    default_sort: tuple[str, bool],
+) -> pd.DataFrame:
+    """
+    Sort df by (column, ascending) pairs, or by default_sort when there are none.
+
+    ages maps a derived "... ago" column to the timestamp column it is computed
+    from. Those columns only exist on the rows sent to the browser, so sorting
+    on them sorts on the timestamp instead (reversed).
+    """
+    by: list[str] = []
+    ascending: list[bool] = []
+    for col, asc in sort_by:
+        if col in ages:
+            col, asc = ages[col], not asc
+        if col in df.columns:
+            by.append(col)
+            ascending.append(asc)
+    if not by and default_sort[0] in df.columns:
+        by, ascending = [default_sort[0]], [default_sort[1]]
+
+    if by:
+        df = df.sort_values(by, ascending=ascending, na_position="last")
+    return df
+
+
+def _format_rows(rows: pd.DataFrame, ages: dict[str, str]) -> pd.DataFrame:
+    """Add the "... ago" columns and format timestamps, for the rows being sent only."""
+    # assign() returns a new frame, so the cached frames are never written to
+    now = _now_utc()
+    rows = rows.assign(**{age: ago_vec(rows[ts], now) for age, ts in ages.items() if ts in rows.columns})
+    return rows.assign(**{
+        c: rows[c].dt.strftime(_DATETIME_FMT)
+        for c in rows.columns
+        if pd.api.types.is_datetime64_any_dtype(rows[c])
+    })
+
+
+def current_page(
+    filtered: pd.DataFrame,
+    page_current: int | None,
+    page_size: int,
+    sort_by: list[dict] | None,
+    filter_query: str | None,
+) -> tuple[pd.DataFrame, int]:
+    """
+    One page of the current view table (page_action="custom"), plus the page count.
+
+    Lowest health first unless sorted otherwise.
+    """
+    ages = {"lastUpdated": "lastUpdateAt"}
+    view = filtered[[c for c in _CURRENT_COLS if c in filtered.columns]]
+    view = view[_filter_query_mask(view, filter_query, ages)]
+    view = _sort_rows(
+        view,
+        [(s["column_id"], s["direction"] == "asc") for s in sort_by or []],
+        ages,
+        default_sort=("healthScore", True),
     )
 
-    return html.Div(cards)
+    page_count = max(1, -(-len(view) // page_size))
+    start = (page_current or 0) * page_size
+    return _format_rows(view.iloc[start:start + page_size], ages), page_count
+
+
+def queue_rows(wo: pd.DataFrame, request: dict | None) -> tuple[pd.DataFrame, int]:
+    """
+    Work order rows for an AG Grid infinite row model getRowsRequest,
+    plus the total row count after filtering.
+
+    Newest first unless sorted otherwise.
+    """
+    request = request or {}
+    ages = {"age": "createdAt"}
+    if wo.empty:
+        return pd.DataFrame(columns=_QUEUE_EMPTY_COLS), 0
+
+    wo = wo[_filter_model_mask(wo, request.get("filterModel"))]
+    wo = _sort_rows(
+        wo,
+        [(m["colId"], m["sort"] == "asc") for m in request.get("sortModel") or []],
+        ages,
+        default_sort=("createdAt", False),
+    )
+
+    start = request.get("startRow") or 0
+    end = request.get("endRow") or start + 100
+    return _format_rows(wo.iloc[start:end], ages), len(wo)
+
+
+def _grid_column_defs(wo: pd.DataFrame) -> list[dict]:
+    """AG Grid columns for the work order grid, with number or text filters."""
+    cols = list(wo.columns) if len(wo.columns) else _QUEUE_EMPTY_COLS
+    defs: list[dict] = []
+    for c in cols:
+        col_def = {"field": c}
+        if c == "age":
+            col_def["filter"] = False
+        elif c in _NUMERIC_COLS or (c in wo.columns and pd.api.types.is_numeric_dtype(wo[c])):
+            col_def["filter"] = "agNumberColumnFilter"
+            col_def["filterParams"] = {"filterOptions": _AG_NUMBER_FILTER_OPTIONS}
+        else:
+            col_def["filter"] = "agTextColumnFilter"
+            col_def["filterParams"] = {"filterOptions": _AG_TEXT_FILTER_OPTIONS}
+        defs.append(col_def)
+    if "age" not in cols:
+        defs.append({"field": "age", "filter": False})
+    return defs
+
+
+def _queue_tab():
+    """
+    Maintenance queue tab: the open work orders grid.
+
+    The grid requests its rows itself through update_queue_rows, scoped by
+    the same plant / line filters.
+    """
+    from .layout import queue_tables
+    grid = queue_tables()
+    grid.columnDefs = _grid_column_defs(load_work_orders())
+    return grid
 
 
 def register_callbacks(app):
-    @app.callback(
+    # Served under the app's prefix, tick.js builds the URL from the same config
+    @app.server.route(app.config.routes_pathname_prefix + "api/data-version")
+    def data_version():
+        # The DataFrames stay server-side in the data_loader cache.
+        # The stores only carry a version token (file mtime) so that
+        # dependent callbacks re-run when the data changes.
+        # Tokens are strings: ns mtimes exceed JavaScript's safe integer range.
+        # If you want live updates later, replace this with DB reads or API calls.
+        return {
+            "current": str(file_version(CURRENT_STATE_CSV)),
+            "workorders": str(file_version(WORK_ORDERS_CSV)),
+        }
+
+    # Poll the version endpoint from the browser (assets/tick.js), so a
+    # tick is one small GET instead of a server callback round-trip.
+    # Stores whose version did not change are left as they are.
+    # store-minute changes once a minute, for the clock-dependent outputs.
+    app.clientside_callback(
+        ClientsideFunction(namespace="tick", function_name="refresh"),
         Output("store-current", "data"),
         Output("store-workorders", "data"),
+        Output("store-minute", "data"),
         Input("tick", "n_intervals"),
-        prevent_initial_call=False,
+        State("store-current", "data"),
+        State("store-workorders", "data"),
+        State("store-minute", "data"),
     )
-    def load_data(_n):
-        # Load from CSV on each tick for simplicity.
-        # If you want live updates later, replace this with DB reads or API calls.
-        from .data_loader import load_current_state, load_work_orders
-
-        df_state = load_current_state()
-        df_wo = load_work_orders()
-
-        return (
-            df_state.to_dict("records"),
-            df_wo.to_dict("records"),
-        )
 
     @app.callback(
         Output("filter-plant", "options"),
@@ -227,83 +650,23 @@ def register_callbacks(app):
         Input("store-current", "data"),
         Input("filter-plant", "value"),
     )
-    def set_filter_options(state_json, selected_plants):
-        df = pd.DataFrame(state_json) if state_json else pd.DataFrame()
-
-        plant_opts: list[dict] = []
-        line_opts: list[dict] = []
-        status_opts: list[dict] = []
-
-        if df.empty:
-            return plant_opts, line_opts, status_opts
-
-        # Plants
-        plant_vals = (
-            df[["plantId", "plantName"]]
-            .dropna(subset=["plantId", "plantName"])
-            .drop_duplicates(subset=["plantId"])
-            .sort_values(["plantName"])
-        )
-        plant_opts = [
-            {"label": r["plantName"], "value": int(r["plantId"])}
-            for _, r in plant_vals.iterrows()
-        ]
-
-        # Decide line option mode based on plant selection
-        # - If exactly one plant is selected, show that plant's lines and filter by lineId.
-        # - If none or multiple plants are selected, show unique lineName and filter by lineName.
+    def set_filter_options(state_token, selected_plants):
         selected_plants = selected_plants or []
         if isinstance(selected_plants, (int, float)):
-            selected_plants = [int(selected_plants)]
-
-        if len(selected_plants) == 1:
-            pid = int(selected_plants[0])
-            df_lines = df[df["plantId"].astype("Int64") == pid][["lineId", "lineName"]]
-            df_lines = (
-                df_lines
-                .dropna(subset=["lineId", "lineName"])
-                .drop_duplicates(subset=["lineId"])
-                .assign(
-                    _line_num=lambda d: d["lineName"]
-                    .astype(str)
-                    .str.extract(r"(\d+)", expand=False)
-                    .fillna("0")
-                    .astype(int)
-                )
-                .sort_values(["_line_num", "lineName"])
-            )
-            line_opts = [
-                {"label": r["lineName"], "value": int(r["lineId"])}
-                for _, r in df_lines.iterrows()
-            ]
-        else:
-            df_lines = df[["lineName"]]
-            df_lines = (
-                df_lines
-                .dropna(subset=["lineName"])
-                .drop_duplicates(subset=["lineName"])
-                .assign(
-                    _line_num=lambda d: d["lineName"]
-                    .astype(str)
-                    .str.extract(r"(\d+)", expand=False)
-                    .fillna("0")
-                    .astype(int)
-                )
-                .sort_values(["_line_num", "lineName"])
-            )
-            line_opts = [
-                {"label": r["lineName"], "value": str(r["lineName"])}
-                for _, r in df_lines.iterrows()
-            ]
-
-        # Status
-        status_vals = sorted(df["resolvedStatus"].dropna().unique().tolist()) if "resolvedStatus" in df.columns else []
-        status_opts = [{"label": s, "value": s} for s in status_vals]
+            selected_plants = [selected_plants]
 
-        return plant_opts, line_opts, status_opts
+        return _filter_options(
+            _state_version(state_token),
+            tuple(int(p) for p in selected_plants),
+        )
 
     @app.callback(
-        Output("kpi-cards", "children"),
+        Output("kpi-machines", "children"),
+        Output("kpi-running", "children"),
+        Output("kpi-idle", "children"),
+        Output("kpi-fault", "children"),
+        Output("kpi-maintenance", "children"),
+        Output("kpi-avghealth", "children"),
         Output("altair-pie", "spec"),
         Output("tab-content", "children"),
         Input("tabs", "value"),
@@ -314,117 +677,109 @@ def register_callbacks(app):
         Input("filter-status", "value"),
         Input("filter-health", "value"),
         Input("filter-stale-only", "value"),
+        Input("store-minute", "data"),
     )
-    def render_dashboard(tab, state_json, wo_json, plant, line, statuses, health_rng, stale_flag):
-        df = pd.DataFrame(state_json) if state_json else pd.DataFrame()
-        df_wo = pd.DataFrame(wo_json) if wo_json else pd.DataFrame()
+    def render_dashboard(tab, state_token, _wo_version, plant, line, statuses, health_rng, stale_flag, _minute):
+        # Only the selected tab's table is built. Switching tabs leaves the
+        # KPI cards and the pie as they are, since the filters did not change.
+        tab_switch = ctx.triggered_id == "tabs"
+        if tab_switch and tab != "tab-current":
+            # The queue tab needs nothing from the machine table
+            return (*(no_update,) * 7, _queue_tab())
 
         stale_only = "stale" in (stale_flag or [])
+        # On a minute tick only the stale-only cutoff moves. The table keeps
+        # its page, sort and filter state; update_current_page and the grid
+        # refresh their rows themselves.
+        minute_tick = set(ctx.triggered_prop_ids) == {"store-minute.data"}
+        if minute_tick and not stale_only:
+            return (no_update,) * 8
+
+        state_version = _state_version(state_token)
+        df = load_current_state(state_version)
+
         filtered = apply_filters(df, plant or [], line or [], statuses, health_rng, stale_only)
 
-        # KPI cards
-        cards = make_kpi_cards(filtered)
-
-        # Altair pie, always based on current plant scope
-        pie_scope = filtered
-        pie_title = "Status distribution (Plant A, Plant B)"
-        if plant:
-            # Map selected plantIds → plantNames
-            plant_names = (
-                df[df["plantId"].isin([int(p) for p in plant])]
-                [["plantId", "plantName"]]
-                .drop_duplicates()
-                .sort_values("plantName")["plantName"]
-                .tolist()
-            )
+        if tab_switch:
+            kpis, pie_html = (no_update,) * 6, no_update
+        else:
+            # One pass over the status column, shared by the KPI cards and the pie
+            vc = status_counts(filtered)
+
+            # KPI card values, the card chrome is static in the layout
+            kpis = kpi_values(filtered, vc)
+
+            # Altair pie, always based on current plant scope
+            pie_title = "Status distribution (Plant A, Plant B)"
+            if plant:
+                # Map selected plantIds → plantNames
+                hier, _ = _distinct_values(state_version)
+                plant_names = (
+                    hier[hier["plantId"].isin([int(p) for p in plant])]
+                    [["plantId", "plantName"]]
+                    .drop_duplicates()
+                    .sort_values("plantName")["plantName"]
+                    .tolist()
+                )
 
-            if len(plant_names) == 1:
-                pie_title = f"Status distribution ({plant_names[0]})"
-            else:
-                pie_title = "Status distribution (" + ", ".join(plant_names) + ")"
-        pie_html = status_pie_chart(pie_scope, title=pie_title)
+                if len(plant_names) == 1:
+                    pie_title = f"Status distribution ({plant_names[0]})"
+                else:
+                    pie_title = "Status distribution (" + ", ".join(plant_names) + ")"
+            pie_html = status_pie_chart(vc, title=pie_title)
+
+        if minute_tick:
+            return (*kpis, pie_html, no_update)
 
         if tab == "tab-current":
-            # Current view table
-            show_cols = [
-                "machineId",
-                "resolvedStatus",
-                "healthScore",
-                "openWorkOrderCount",
-                "lastUpdateAt",
-                "plantName",
-                "lineName",
-                "machineType",
-                "faultCodeId",
-                "lastWorkOrderId",
-                "lastWorkOrderCreatedByType",
-                "lastWorkOrderCreatedById",
-            ]
-            cols = [c for c in show_cols if c in filtered.columns]
-            view = filtered[cols].copy()
-
-            # Add human readable last update
-            now = _now_utc()
-            if "lastUpdateAt" in view.columns:
-                _ts = pd.to_datetime(view["lastUpdateAt"], utc=True, errors="coerce")
-                view["lastUpdated"] = _ts.apply(lambda x: ago(x, now))
-                # Format the timestamp column for display
-                view["lastUpdateAt"] = _ts.dt.strftime("%Y-%m-%d %H:%M")
-
-            from .layout import current_table
+            # Current view table, only the first page is sent here and
+            # update_current_page serves the rest
+            from .layout import current_table, table_filter_help
             table = current_table()
-            table.columns = _datatable_columns(view)
-            table.data = view.sort_values("healthScore", ascending=True).to_dict("records")
-
-            return cards, pie_html, html.Div([table])
-
-        # Maintenance queue tab
-        # Open work orders table scoped by same filters
-        if not df_wo.empty:
-            wo = df_wo.copy()
-
-            # Plant scope (multi)
-            if plant and "plantId" in wo.columns:
-                plant_ids = [int(p) for p in (plant or []) if p is not None]
-                if plant_ids:
-                    wo = wo[wo["plantId"].astype("Int64").isin(plant_ids)]
-
-            # Line scope (multi)
-            # - If line selections are ints, filter by lineId.
-            # - If line selections are strings, filter by lineName.
-            if line:
-                line_ids: list[int] = []
-                line_names: list[str] = []
-                for v in (line or []):
-                    if v is None:
-                        continue
-                    if isinstance(v, (int, float)) and "lineId" in wo.columns:
-                        line_ids.append(int(v))
-                    else:
-                        line_names.append(str(v))
-
-                if line_ids and "lineId" in wo.columns:
-                    wo = wo[wo["lineId"].astype("Int64").isin(line_ids)]
-                if line_names and "lineName" in wo.columns:
-                    wo = wo[wo["lineName"].astype(str).isin(line_names)]
-
-            now = _now_utc()
-            if "createdAt" in wo.columns:
-                _created = pd.to_datetime(wo["createdAt"], utc=True, errors="coerce")
-                wo["age"] = _created.apply(lambda x: ago(x, now))
-                wo["createdAt"] = _created.dt.strftime("%Y-%m-%d %H:%M")
-
-            if "closedAt" in wo.columns:
-                _closed = pd.to_datetime(wo["closedAt"], utc=True, errors="coerce")
-                wo["closedAt"] = _closed.dt.strftime("%Y-%m-%d %H:%M")
-        else:
-            wo = pd.DataFrame(columns=["workOrderId", "machineId", "status", "createdAt", "age", "createdByType", "createdById", "issueType"])
+            page, table.page_count = current_page(filtered, 0, table.page_size, [], "")
+            table.columns = _datatable_columns(page)
+            table.data = page.to_dict("records")
+
+            return (*kpis, pie_html, html.Div([table, table_filter_help()]))
 
-        from .layout import queue_tables
-        table = queue_tables()
+        return (*kpis, pie_html, _queue_tab())
 
-        # Fill work orders table
-        table.columns = _datatable_columns(wo)
-        table.data = wo.sort_values("createdAt", ascending=False).to_dict("records")
+    @app.callback(
+        Output("table-current", "data"),
+        Output("table-current", "page_count"),
+        Input("table-current", "page_current"),
+        Input("table-current", "page_size"),
+        Input("table-current", "sort_by"),
+        Input("table-current", "filter_query"),
+        Input("store-minute", "data"),
+        State("store-current", "data"),
+        State("filter-plant", "value"),
+        State("filter-line", "value"),
+        State("filter-status", "value"),
+        State("filter-health", "value"),
+        State("filter-stale-only", "value"),
+        prevent_initial_call=True,
+    )
+    def update_current_page(
+        page_current, page_size, sort_by, filter_query, _minute, state_token,
+        plant, line, statuses, health_rng, stale_flag,
+    ):
+        # Also re-run on the minute tick, so the lastUpdated ages and the
+        # stale-only cutoff follow the clock without resetting the table state
+        stale_only = "stale" in (stale_flag or [])
+        df = load_current_state(_state_version(state_token))
+        filtered = apply_filters(df, plant or [], line or [], statuses, health_rng, stale_only)
+        page, page_count = current_page(filtered, page_current, page_size, sort_by, filter_query)
+        return page.to_dict("records"), page_count
 
-        return cards, pie_html, table
+    @app.callback(
+        Output("table-workorders", "getRowsResponse"),
+        Input("table-workorders", "getRowsRequest"),
+        State("filter-plant", "value"),
+        State("filter-line", "value"),
+        prevent_initial_call=True,
+    )
+    def update_queue_rows(request, plant, line):
+        wo = filter_work_orders(load_work_orders(), plant or [], line or [])
+        rows, row_count = queue_rows(wo, request)
+        return {"rowData": rows.to_dict("records"), "rowCount": row_count}
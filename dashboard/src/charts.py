@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from functools import lru_cache
+
 import altair as alt
 import pandas as pd
 
@@ -13,9 +15,25 @@ STATUS_COLOR_MAP = {
 }
 
 
-def status_pie_chart(df: pd.DataFrame, title: str = "Status distribution") -> str:
-    """Return an Altair chart rendered as an HTML string for Dash Iframe srcDoc."""
-    if df.empty:
+def status_pie_chart(
+    counts: pd.Series | dict[str, int],
+    title: str = "Status distribution",
+) -> dict:
+    """
+    Return a Vega spec for the status pie.
+
+    counts maps resolvedStatus -> number of machines, e.g. a value_counts() result.
+    """
+    counts = pd.Series(counts, dtype="int64")
+    counts = counts[counts > 0].sort_values(ascending=False)
+    return _pie_spec(tuple(zip(counts.index.astype(str), counts.tolist())), title)
+
+
+@lru_cache(maxsize=256)
+def _pie_spec(counts: tuple[tuple[str, int], ...], title: str) -> dict:
+    # Cached on the (status, count) pairs and title, so identical pies are
+    # built and validated by Altair only once. Callers must not mutate the result.
+    if not counts:
         empty = (
             alt.Chart(pd.DataFrame({"x": [1], "y": [1]}),)
             .mark_text(text="No data", size=18)
@@ -24,12 +42,7 @@ def status_pie_chart(df: pd.DataFrame, title: str = "Status distribution") -> st
         )
         return empty.to_dict(format="vega")
 
-    agg = (
-        df.groupby("resolvedStatus", dropna=False)
-        .size()
-        .reset_index(name="count")
-        .sort_values("count", ascending=False)
-    )
+    agg = pd.DataFrame(list(counts), columns=["resolvedStatus", "count"])
 
     domain = list(STATUS_COLOR_MAP.keys())
     range_ = list(STATUS_COLOR_MAP.values())
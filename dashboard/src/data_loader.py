@@ -1,48 +1,100 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
 
 import pandas as pd
 
-from .utils import parse_dt
+from .utils import parse_dt_series
 
 
 DATA_DIR = Path(__file__).resolve().parents[1] / "data"
+CURRENT_STATE_CSV = DATA_DIR / "current_machine_state.csv"
+WORK_ORDERS_CSV = DATA_DIR / "work_orders.csv"
 
 
-def load_current_state() -> pd.DataFrame:
-    path = DATA_DIR / "current_machine_state.csv"
-    df = pd.read_csv(path)
-
-    # Parse datetimes
-    for col in [
-        "lastUpdateAt",
-        "lastTelemetryAt",
-        "lastOverrideAt",
-        "lastWorkOrderChangeAt",
-    ]:
+def _parse_datetimes(df: pd.DataFrame, cols: list[str]) -> None:
+    # Vectorized parse, blanks become NaT.
+    # The pyarrow reader usually infers these already, then this only
+    # localizes them to UTC.
+    for col in cols:
         if col in df.columns:
-            df[col] = df[col].apply(lambda x: parse_dt(x) if pd.notna(x) else None)
+            df[col] = parse_dt_series(df[col])
 
-    # Ensure types
-    for col in ["machineId", "plantId", "lineId", "openWorkOrderCount"]:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
 
-    if "healthScore" in df.columns:
-        df["healthScore"] = pd.to_numeric(df["healthScore"], errors="coerce")
+def file_version(path: Path) -> int:
+    """Return the file mtime in ns, or 0 if the file does not exist."""
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return 0
 
-    return df
+
+def load_current_state(version: int | None = None) -> pd.DataFrame:
+    """
+    Load the current machine state.
+
+    The parsed frame is cached until the CSV changes on disk, so callers
+    share one object and must not modify it in place.
+    Pass version (a file_version() value the caller already read) to get the
+    frame cached under that version instead of re-statting the file.
+    """
+    path = CURRENT_STATE_CSV
+    if version is None:
+        version = file_version(path)
+    return _read_current_state(str(path), version)
 
 
 def load_work_orders() -> pd.DataFrame:
-    path = DATA_DIR / "work_orders.csv"
-    if not path.exists():
+    """Load work orders, cached the same way as load_current_state."""
+    path = WORK_ORDERS_CSV
+    return _read_work_orders(str(path), file_version(path))
+
+
+# Column dtypes applied by read_csv itself, so no column is re-parsed after
+# loading. Columns missing from the file are ignored.
+# Low-cardinality labels are categorical, which keeps them small and speeds
+# up the isin / value_counts / groupby calls in the callbacks.
+_STATE_DTYPES: dict[str, str] = {
+    "machineId": "Int64",
+    "plantId": "Int64",
+    "lineId": "Int64",
+    "openWorkOrderCount": "Int64",
+    "faultCodeId": "Int64",
+    "healthScore": "float64",
+    "resolvedStatus": "category",
+    "statusRaw": "category",
+    "machineType": "category",
+    "plantName": "category",
+    "lineName": "category",
+    "lastWorkOrderCreatedByType": "category",
+}
+
+
+@lru_cache(maxsize=4)
+def _read_current_state(path_str: str, _mtime_ns: int) -> pd.DataFrame:
+    df = pd.read_csv(path_str, dtype=_STATE_DTYPES, engine="pyarrow")
+
+    # Parse datetimes
+    _parse_datetimes(
+        df,
+        [
+            "lastUpdateAt",
+            "lastTelemetryAt",
+            "lastOverrideAt",
+            "lastWorkOrderChangeAt",
+        ],
+    )
+
+    return df
+
+
+@lru_cache(maxsize=4)
+def _read_work_orders(path_str: str, mtime_ns: int) -> pd.DataFrame:
+    if not mtime_ns:
         return pd.DataFrame()
 
-    df = pd.read_csv(path)
-    for col in ["createdAt", "closedAt"]:
-        if col in df.columns:
-            df[col] = df[col].apply(lambda x: parse_dt(x) if pd.notna(x) and x != "" else None)
+    df = pd.read_csv(path_str, engine="pyarrow")
+    _parse_datetimes(df, ["createdAt", "closedAt"])
 
-    return df
\ No newline at end of file
+    return df
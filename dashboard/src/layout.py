@@ -1,17 +1,48 @@
 from __future__ import annotations
 
 import dash
+import dash_ag_grid as dag
 import dash_bootstrap_components as dbc
 from dash import dcc, html, dash_table
 import dash_vega_components as dvc
 
 
+# Match Altair / Vega-Lite categorical defaults (Tableau 10 first 4)
+# Used for KPI card backgrounds to stay consistent with the pie chart.
+STATUS_CARD_COLORS: dict[str, str] = {
+    "Running": "#4E79A7",  # blue
+    "Idle": "#F28E2B",  # orange
+    "Fault": "#E15759",  # red
+    "UnderMaintenance": "#76B7B2",  # teal
+}
+
+OTHER_CARD_COLORS: dict[str, str] = {
+    "Machines": "#6C757D",  # bootstrap secondary-ish
+    "Average health": "#59A14F",  # green
+}
+
+
+_LAYOUT: dbc.Container | None = None
+
+
 def build_layout(app: dash.Dash) -> html.Div:
+    """
+    The page layout. It has no runtime inputs, so the tree is built on the
+    first call and the same object is returned afterwards.
+    """
+    global _LAYOUT
+    if _LAYOUT is None:
+        _LAYOUT = _build_layout()
+    return _LAYOUT
+
+
+def _build_layout() -> dbc.Container:
     return dbc.Container(
         fluid=True,
         children=[
             dcc.Store(id="store-current"),
             dcc.Store(id="store-workorders"),
+            dcc.Store(id="store-minute"),
             dcc.Interval(id="tick", interval=60_000, n_intervals=0),
 
             dbc.Row(
@@ -19,52 +50,67 @@ def build_layout(app: dash.Dash) -> html.Div:
                     dbc.Col(
                         [
                             html.H4("Filters", className="mt-2"),
-                            html.Br(),
-                            dbc.Label("Plant"),
-                            dcc.Dropdown(
-                                id="filter-plant",
-                                multi=True,
-                                placeholder="All plants"
+                            html.Div(
+                                [
+                                    dbc.Label("Plant"),
+                                    dcc.Dropdown(
+                                        id="filter-plant",
+                                        multi=True,
+                                        placeholder="All plants"
+                                    ),
+                                ],
+                                className="filter-row",
                             ),
-                            html.Br(),
-                            dbc.Label("Production line", className="mt-2"),
-                            dcc.Dropdown(
-                                id="filter-line",
-                                multi=True,
-                                placeholder="All lines"
+                            html.Div(
+                                [
+                                    dbc.Label("Production line"),
+                                    dcc.Dropdown(
+                                        id="filter-line",
+                                        multi=True,
+                                        placeholder="All lines"
+                                    ),
+                                ],
+                                className="filter-row",
                             ),
-                            html.Br(),
-                            dbc.Label("Resolved status", className="mt-2"),
-                            dcc.Dropdown(
-                                id="filter-status",
-                                multi=True,
-                                placeholder="All statuses",
+                            html.Div(
+                                [
+                                    dbc.Label("Resolved status"),
+                                    dcc.Dropdown(
+                                        id="filter-status",
+                                        multi=True,
+                                        placeholder="All statuses",
+                                    ),
+                                ],
+                                className="filter-row",
                             ),
-                            html.Br(),
-                            dbc.Label("Health score range", className="mt-2"),
-                            dcc.RangeSlider(
-                                id="filter-health",
-                                min=0,
-                                max=100,
-                                step=1,
-                                value=[0, 100],
-                                marks={0: "0", 50: "50", 100: "100"},
-                                tooltip={"placement": "bottom", "always_visible": False},
+                            html.Div(
+                                [
+                                    dbc.Label("Health score range"),
+                                    dcc.RangeSlider(
+                                        id="filter-health",
+                                        min=0,
+                                        max=100,
+                                        step=1,
+                                        value=[0, 100],
+                                        marks={0: "0", 50: "50", 100: "100"},
+                                        tooltip={"placement": "bottom", "always_visible": False},
+                                    ),
+                                ],
+                                className="filter-row",
                             ),
-                            html.Br(),
                             dbc.Checklist(
                                 id="filter-stale-only",
                                 options=[{"label": "Show only stale machines (last update older than 30 mins)", "value": "stale"}],
                                 value=[],
-                                className="mt-3",
+                                className="filter-row",
                             ),
-                            html.Br(),
                             html.Hr(),
                             dcc.Loading(
                                 children=dvc.Vega(
                                     id="altair-pie",
                                     spec={},
-                                    opt={"actions": False, "renderer": "svg"},
+                                    # Canvas draws the pie into one element instead of a DOM node per mark
+                                    opt={"actions": False, "renderer": "canvas"},
                                     style={
                                         "width": "90%",
                                         "height": "35vh",
@@ -83,7 +129,7 @@ def build_layout(app: dash.Dash) -> html.Div:
                         [
                             dbc.Row(
                                 [
-                                    dbc.Col(html.Div(id="kpi-cards"), width=12),
+                                    dbc.Col(html.Div(kpi_cards(), id="kpi-cards"), width=12),
                                 ],
                                 className="mt-2",
                             ),
@@ -109,28 +155,103 @@ def build_layout(app: dash.Dash) -> html.Div:
     )
 
 
+def kpi_cards() -> dbc.Row:
+    """
+    KPI card chrome, built once with the layout.
+
+    Callbacks only update the html.H3 values by id (see callbacks.kpi_values).
+    """
+    def _card(title: str, value_id: str, bg: str, fg: str = "white"):
+        card = dbc.Card(
+            dbc.CardBody(
+                [
+                    html.Div(title, style={"opacity": 0.9}),
+                    html.H3(id=value_id, style={"margin": 0}),
+                ]
+            ),
+            style={
+                "backgroundColor": bg,
+                "color": fg,
+                "border": "0",
+                "boxShadow": "0 1px 2px rgba(0,0,0,0.06)",
+            },
+        )
+        return dcc.Loading(children=card)
+
+    return dbc.Row(
+        [
+            dbc.Col(_card("Machines", "kpi-machines", OTHER_CARD_COLORS["Machines"])),
+            dbc.Col(_card("Running", "kpi-running", STATUS_CARD_COLORS["Running"])),
+            dbc.Col(_card("Idle", "kpi-idle", STATUS_CARD_COLORS["Idle"])),
+            dbc.Col(_card("Fault", "kpi-fault", STATUS_CARD_COLORS["Fault"])),
+            dbc.Col(_card("Under maintenance", "kpi-maintenance", STATUS_CARD_COLORS["UnderMaintenance"])),
+            dbc.Col(_card("Average health", "kpi-avghealth", OTHER_CARD_COLORS["Average health"])),
+        ],
+        className="g-3",
+        justify="around",
+        style={"margin": "0px", "padding": "0px"},
+    )
+
+
+# Fixed height and column widths let the virtualized tables size rows
+# without re-measuring the DOM while scrolling.
+_TABLE_STYLE = {"overflowX": "auto", "overflowY": "auto", "height": "70vh"}
+_CELL_STYLE = {
+    "padding": "6px",
+    "fontFamily": "inherit",
+    "fontSize": 14,
+    "whiteSpace": "nowrap",
+    "overflow": "hidden",
+    "textOverflow": "ellipsis",
+    "minWidth": "80px",
+    "width": "120px",
+    "maxWidth": "200px",
+}
+
+
 def current_table() -> dash_table.DataTable:
     return dash_table.DataTable(
         id="table-current",
-        page_size=20,
-        sort_action="native",
-        filter_action="native",
+        # Paged, sorted and filtered server-side, see callbacks.current_page
+        page_action="custom",
+        page_current=0,
+        # Larger server pages, the browser only mounts the rows in view
+        page_size=100,
+        virtualization=True,
+        fixed_rows={"headers": True},
+        sort_action="custom",
+        filter_action="custom",
         row_selectable=False,
-        style_table={'overflowY': 'auto'},
-        style_cell={"padding": "6px", "fontFamily": "inherit", "fontSize": 14, "whiteSpace": "nowrap"},
+        style_table=_TABLE_STYLE,
+        style_cell=_CELL_STYLE,
         style_header={"fontWeight": "600"},
         filter_options={"placeholder_text": "Filter.."},
     )
 
 
-def queue_tables() -> html.Div:
-    return dash_table.DataTable(
+def table_filter_help() -> html.Small:
+    """Filter syntax supported by the server-side table filter (callbacks._filter_query_mask)."""
+    return html.Small(
+        "Filters: contains, =, !=, <, <=, >, >=, datestartswith, "
+        "is blank / nil / num / str / even / odd. "
+        "Filters on different columns are combined with AND. "
+        "\"or\", parentheses and \"!\" are not supported and match no rows.",
+        className="text-muted",
+    )
+
+
+def queue_tables() -> dag.AgGrid:
+    return dag.AgGrid(
         id="table-workorders",
-        page_size=20,
-        sort_action="native",
-        filter_action="native",
-        style_table={"overflowX": "auto"},
-        style_cell={"padding": "6px", "fontFamily": "inherit", "fontSize": 14, "whiteSpace": "nowrap"},
-        style_header={"fontWeight": "600"},
-        filter_options={"placeholder_text": "Filter.."},
+        # Infinite row model: the grid asks for row blocks as it scrolls and
+        # callbacks.queue_rows sorts, filters and slices them server-side
+        rowModelType="infinite",
+        defaultColDef={"sortable": True, "resizable": True, "minWidth": 80},
+        dashGridOptions={
+            "pagination": True,
+            "paginationPageSize": 100,
+            "cacheBlockSize": 100,
+            "rowBuffer": 10,
+        },
+        style={"height": "70vh"},
     )
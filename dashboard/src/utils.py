@@ -1,35 +1,94 @@
 from __future__ import annotations
 
+import sys
+import time
+from bisect import bisect_right
 from datetime import datetime, timezone
 
+import numpy as np
+import pandas as pd
 
-def parse_dt(value: str | None) -> datetime | None:
-    if value is None or value == "":
-        return None
-    # ISO8601 expected
-    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+_fromiso = datetime.fromisoformat
+
+# ISO8601 expected. fromisoformat accepts a trailing "Z" natively from
+# Python 3.11, so pick the implementation once at import time instead of
+# checking the version on every call.
+if sys.version_info >= (3, 11):
+    def parse_dt(value: str | None) -> datetime | None:
+        if not value:
+            return None
+        return _fromiso(value)
+else:
+    def parse_dt(value: str | None) -> datetime | None:
+        if not value:
+            return None
+        if value[-1] == "Z":
+            value = value[:-1] + "+00:00"
+        return _fromiso(value)
+
+
+def parse_dt_series(values: pd.Series) -> pd.Series:
+    """Vectorized parse_dt for a whole column. Blanks and bad values become NaT."""
+    return pd.to_datetime(values, format="ISO8601", utc=True, cache=True, errors="coerce")
+
+
+# ago() units: (divisor in seconds, singular, plural), picked by bisecting
+# _AGO_THRESHOLDS. Ages under a minute (or negative) read "just now".
+_AGO_THRESHOLDS = (60, 3600, 86400)
+_AGO_UNITS = (
+    (1, "just now", "just now"),
+    (60, "{} min ago", "{} mins ago"),
+    (3600, "{} hr ago", "{} hrs ago"),
+    (86400, "{} day ago", "{} days ago"),
+)
+
+
+# (monotonic time, utc now) reused by ago() calls without an explicit now,
+# refreshed at most once a second
+_NOW_CACHE: list = [float("-inf"), None]
+
+
+def _cached_now() -> datetime:
+    t = time.monotonic()
+    if t - _NOW_CACHE[0] > 1.0:
+        _NOW_CACHE[:] = [t, datetime.now(timezone.utc)]
+    return _NOW_CACHE[1]
 
 
 def ago(dt: datetime | None, now: datetime | None = None) -> str:
+    """
+    Human readable age of dt, e.g. "5 mins ago".
+
+    Pass now when formatting many values; without it a cached clock
+    reading (at most a second old) is used.
+    """
     if dt is None:
         return "N/A"
     if now is None:
-        now = datetime.now(timezone.utc)
+        now = _cached_now()
 
-    delta = now - dt
-    seconds = int(delta.total_seconds())
+    seconds = int((now - dt).total_seconds())
 
-    if seconds < 0:
-        return "just now"
+    div, singular, plural = _AGO_UNITS[bisect_right(_AGO_THRESHOLDS, seconds)]
+    n = seconds // div
+    return (singular if n == 1 else plural).format(n)
+
+
+def ago_vec(ts: pd.Series, now: datetime) -> pd.Series:
+    """Vectorized ago() over a tz-aware datetime Series. NaT becomes "N/A"."""
+    # Whole seconds as int64, no float total_seconds() round trip
+    delta = (now - ts).to_numpy(dtype="timedelta64[s]")
+    missing = np.isnat(delta)
+    seconds = delta.astype(np.int64)
 
     minutes = seconds // 60
     hours = minutes // 60
     days = hours // 24
 
-    if seconds < 60:
-        return "just now"
-    if minutes < 60:
-        return f"{minutes} min ago" if minutes == 1 else f"{minutes} mins ago"
-    if hours < 24:
-        return f"{hours} hr ago" if hours == 1 else f"{hours} hrs ago"
-    return f"{days} day ago" if days == 1 else f"{days} days ago"
+    conds = [minutes < 60, hours < 24]
+    n = np.select(conds, [minutes, hours], days).astype(np.int64)
+    unit = np.select(conds, ["min", "hr"], "day")
+
+    text = pd.Series(n.astype(str), index=ts.index) + " " + unit + np.where(n == 1, "", "s") + " ago"
+    return text.where(seconds >= 60, "just now").where(~missing, "N/A")